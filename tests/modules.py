@@ -0,0 +1,59 @@
+"""Builds minimal modules for the tests."""
+from io import BytesIO
+import struct
+
+def build_xm(orders, patterns, instruments, channel_count=1):
+    """
+    Returns a minimal XM file. patterns are lists of packed pattern data, and
+    instruments are lists of (samples, keymap) pairs. samples is either a
+    number of short, silent samples, or a list of (type flag, data) pairs.
+    """
+    xm_file = bytearray(b"Extended Module: " + b"test".ljust(20) + b"\x1a"
+                        + b"test".ljust(20) + b"\x04\x01")
+    xm_file += struct.pack("<IHHHHHHHH", 276, len(orders), 0, channel_count,
+                           len(patterns), len(instruments), 1, 6, 125)
+    xm_file += bytes(orders).ljust(256, b"\x00")
+
+    for pattern_data in patterns:
+        xm_file += struct.pack("<IBHH", 9, 0, 64, len(pattern_data)) + pattern_data
+
+    for samples, keymap in instruments:
+        if isinstance(samples, int):
+            samples = [(0, bytes(4))] * samples
+        xm_file += struct.pack("<I22sBH", 263, b"", 0, len(samples))
+        xm_file += struct.pack("<I", 40) + bytes(keymap) + bytes(263 - 29 - 100)
+        for type_flag, data in samples:
+            xm_file += struct.pack("<IIIBbBBbB22s", len(data), 0, 0, 64, 0,
+                                   type_flag, 128, 0, 0, b"")
+        for _, data in samples:
+            xm_file += data
+
+    return BytesIO(bytes(xm_file))
+
+def build_it(orders, patterns, keyboards, sample_count=2):
+    """
+    Returns a minimal IT file using instruments. patterns are lists of packed
+    pattern data, and keyboards map each note to a sample for an instrument.
+    """
+    header = bytearray(b"IMPM" + b"test".ljust(26, b"\x00") + bytes(2))
+    header += struct.pack("<HHHHHHHH", len(orders), len(keyboards), sample_count,
+                          len(patterns), 0x214, 0x214, 0b00000101, 0)
+    header += bytes(192 - len(header))
+    header += bytes(orders)
+
+    pointer = len(header) + 4 * (len(keyboards) + sample_count + len(patterns))
+    blobs = []
+    for keyboard in keyboards:
+        instrument = bytearray(b"IMPI" + bytes(0x40 - 4))
+        for note in range(120):
+            instrument += bytes([note, keyboard(note)])
+        blobs.append(bytes(instrument.ljust(554, b"\x00")))
+    for _ in range(sample_count):
+        blobs.append(b"IMPS" + bytes(14) + b"\x01" + bytes(27) + b"\x01" + bytes(33))
+    for pattern_data in patterns:
+        blobs.append(struct.pack("<HH4x", len(pattern_data), 64) + pattern_data)
+
+    for blob in blobs:
+        header += struct.pack("<I", pointer)
+        pointer += len(blob)
+    return BytesIO(bytes(header) + b"".join(blobs))
@@ -0,0 +1,68 @@
+"""Tests for naming and comparing manifest records."""
+import errno
+import io
+from pathlib import Path
+
+import pytest
+
+from trackrip import ManifestSink, manifest, rip
+from trackrip.__main__ import write_manifest
+
+from modules import build_xm
+
+def make_records(module, module_hash, sample_hashes):
+    """Returns manifest records for a module, keyed like read_manifest()."""
+    records = {}
+    for number, sample_hash in enumerate(sample_hashes):
+        records[(module, number)] = {"module": module, "module_hash": module_hash,
+                                     "number": number, "hash": sample_hash}
+    return records
+
+def test_module_name_is_relative_to_root(tmp_path):
+    module_path = tmp_path / "songs" / "song.mod"
+    assert manifest.get_module_name(module_path, tmp_path) == "songs/song.mod"
+    assert manifest.get_module_name(module_path, tmp_path / "elsewhere") \
+        == Path(module_path).resolve().as_posix()
+
+def test_modules_without_paths_are_named_by_hash():
+    sink = ManifestSink()
+    modules = [build_xm([0], [bytes([0x80])], [(samples, [0] * 96)]) for samples in (1, 2)]
+    for module in modules:
+        rip(module, sink)
+    names = [record["module"] for record in sink.records]
+    assert names == [manifest.hash_module(modules[0])] \
+        + [manifest.hash_module(modules[1])] * 2
+
+def test_moved_module_is_matched_by_hash():
+    old = make_records("song.mod", "abc", ["1", "2"])
+    new = make_records("/archive/song.mod", "abc", ["1", "2"])
+    assert manifest.compare_manifests(old, new) == []
+
+def test_moved_module_reports_changed_samples():
+    old = make_records("song.mod", "abc", ["1", "2"])
+    new = make_records("/archive/song.mod", "abc", ["1", "3"])
+    assert manifest.compare_manifests(old, new) == ["~ song.mod #1: hash '2' -> '3'"]
+
+def test_different_modules_are_not_matched():
+    old = make_records("a.mod", "abc", ["1"])
+    new = make_records("b.mod", "def", ["1"])
+    assert manifest.compare_manifests(old, new) == ["- a.mod #0", "+ b.mod #0"]
+
+class FailingOutput(io.StringIO):
+    """A text file that fails with error once anything's written to it."""
+
+    def __init__(self, error):
+        super().__init__()
+        self.error = error
+
+    def write(self, text):
+        raise self.error
+
+@pytest.mark.parametrize("error", [BrokenPipeError(errno.EPIPE, "Broken pipe"),
+                                   OSError(errno.ENOSPC, "No space left on device")])
+def test_output_errors_are_not_module_errors(tmp_path, error):
+    module_path = tmp_path / "song.xm"
+    module_path.write_bytes(build_xm([0], [bytes([0x80])], [(1, [0] * 96)]).getvalue())
+    with pytest.raises(type(error)) as raised:
+        write_manifest([module_path], FailingOutput(error))
+    assert raised.value is error
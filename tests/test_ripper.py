@@ -0,0 +1,34 @@
+"""Tests for ripping modules a chunk at a time."""
+import random
+
+import pytest
+
+from trackrip import CallbackSink, rip, tracker
+
+from modules import build_xm
+
+def build_delta_xm():
+    """Returns an XM with noisy 8-bit & 16-bit delta encoded samples."""
+    noise = random.Random(0)
+    samples = [
+        (0b00000000, bytes(noise.randrange(256) for _ in range(301))),
+        (0b00010000, bytes(noise.randrange(256) for _ in range(300))),
+        # an odd length leaves half a 16-bit value at the end
+        (0b00010000, bytes(noise.randrange(256) for _ in range(301))),
+    ]
+    return build_xm([0], [bytes([0x80])], [(samples, [0] * 96)])
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64])
+def test_chunked_rip_matches_whole_samples(chunk_size):
+    expected = [sample["data"] for sample in
+                tracker.identify_module(build_delta_xm()).samples]
+
+    ripped = []
+    def collect(sample, data):
+        chunks = [bytes(chunk) for chunk in data]
+        # 16-bit values are never split between chunks
+        assert all(len(chunk) % sample["width"] == 0 for chunk in chunks[:-1])
+        ripped.append(b"".join(chunks))
+
+    rip(build_delta_xm(), CallbackSink(collect), chunk_size=chunk_size)
+    assert ripped == expected
@@ -0,0 +1,43 @@
+"""Tests for running the server on a Unix socket."""
+import os
+from pathlib import Path
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+
+def wait_for(condition, timeout=10):
+    """Waits until condition() is true, returning whether it ever was."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+def test_server_stops_with_idle_client_connected(tmp_path):
+    socket_path = tmp_path / "trackrip.sock"
+    env = dict(os.environ, PYTHONPATH=str(PACKAGE_DIR))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "trackrip", "serve", "-s", str(socket_path), "-j", "1"],
+        env=env, stderr=subprocess.PIPE)
+    try:
+        assert wait_for(socket_path.exists)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(socket_path))
+            # give the server a moment to start handling the connection
+            time.sleep(0.2)
+            server.send_signal(signal.SIGTERM)
+            assert server.wait(timeout=5) == 0
+            # the server hung up on us
+            assert client.recv(1) == b""
+        assert not socket_path.exists()
+        assert b"Traceback" not in server.stderr.read()
+    finally:
+        if server.poll() is None:
+            server.kill()
+            server.wait()
+        server.stderr.close()
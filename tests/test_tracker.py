@@ -0,0 +1,65 @@
+"""Tests for finding the samples a module's patterns play."""
+from io import BytesIO
+import struct
+
+from trackrip import tracker
+
+from modules import build_it, build_xm
+
+def test_xm_carries_instrument_into_next_pattern():
+    # instrument 1 plays sample 0 below C-4, and sample 1 from C-4 up
+    instruments = [(2, [0] * 48 + [1] * 48)]
+    patterns = [
+        bytes([60, 1, 0, 0, 0]),
+        bytes([0x80]),
+        # no instrument, so instrument 1 from pattern 0 keeps playing
+        bytes([0x81, 30]),
+    ]
+    module = tracker.identify_module(build_xm([0, 2], patterns, instruments),
+                                     load_samples=False)
+    assert module.find_used_samples() == {0, 1}
+
+def test_xm_skips_patterns_not_in_orders():
+    instruments = [(1, [0] * 96), (1, [0] * 96)]
+    patterns = [bytes([49, 1, 0, 0, 0]), bytes([49, 2, 0, 0, 0])]
+    module = tracker.identify_module(build_xm([0], patterns, instruments),
+                                     load_samples=False)
+    assert module.find_used_samples() == {0}
+
+def test_it_carries_instrument_into_next_pattern():
+    keyboards = [lambda note: 1 if note < 60 else 2]
+    patterns = [
+        # channel 1: note 70, instrument 1
+        bytes([0x81, 0b00000011, 70, 1, 0]),
+        # channel 1: note 30, no instrument
+        bytes([0x81, 0b00000001, 30, 0]),
+    ]
+    module = tracker.identify_module(build_it([0, 1], patterns, keyboards),
+                                     load_samples=False)
+    assert module.find_used_samples() == {0, 1}
+
+def test_it_reuses_packed_values_within_pattern():
+    keyboards = [lambda note: 1, lambda note: 2]
+    patterns = [bytes([
+        0x81, 0b00000011, 40, 2, 0,
+        # same mask as before, on a new note
+        0x01, 41, 2, 0,
+        # the last note & instrument again
+        0x81, 0b00110000, 0,
+    ])]
+    module = tracker.identify_module(build_it([0], patterns, keyboards),
+                                     load_samples=False)
+    assert module.find_used_samples() == {1}
+
+def test_mod_finds_sample_numbers_in_ordered_patterns():
+    mod_file = bytearray(b"test".ljust(20, b"\x00"))
+    for _ in range(31):
+        mod_file += b"".ljust(22, b"\x00") + struct.pack(">HBBHH", 2, 0, 64, 0, 1)
+    mod_file += bytes([1, 127]) + bytes([0, 1]).ljust(128, b"\x00") + b"M.K."
+    # pattern 0 plays sample 17, pattern 1 plays sample 3
+    for sample in (17, 3):
+        mod_file += bytes([sample & 0xF0, 0, (sample & 0x0F) << 4, 0]) + bytes(1020)
+    mod_file += bytes(4 * 31)
+
+    module = tracker.identify_module(BytesIO(bytes(mod_file)), load_samples=False)
+    assert module.find_used_samples() == {16}
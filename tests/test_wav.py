@@ -0,0 +1,7 @@
+"""Tests for encoding samples as WAV files."""
+from trackrip import wav
+
+def test_file_names_leave_sample_names_alone():
+    sample = {"number": 3, "name": "kick\x00\x00"}
+    assert wav.get_file_name(sample) == "3 - kick.wav"
+    assert sample["name"] == "kick\x00\x00"
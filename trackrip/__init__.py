@@ -1 +1,23 @@
 __version__ = "2.0.0"
+
+# the library API is imported on first use, so that the CLI & setup.py don't
+# pay for modules they never touch
+_LAZY_NAMES = {
+    "rip": ".ripper",
+    "Sink": ".sink",
+    "DirectorySink": ".sink",
+    "MemorySink": ".sink",
+    "CallbackSink": ".sink",
+    "TarSink": ".sink",
+    "ZipSink": ".sink",
+    "ManifestSink": ".sink",
+}
+
+def __getattr__(name):
+    if name in _LAZY_NAMES:
+        from importlib import import_module # pylint: disable=import-outside-toplevel
+        return getattr(import_module(_LAZY_NAMES[name], __name__), name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_NAMES))
@@ -1,108 +1,91 @@
 """Rips all samples contained in a specified tracker music file to WAV."""
 
 import argparse
+from importlib import import_module
+import os
 from pathlib import Path
-import string
-import wave
-from math import floor
-from . import tracker
-import re
+import sys
 
-def main():
+# subcommands, and the modules they live in, which are only imported when used
+COMMANDS = {"serve": ".server", "submit": ".server", "compare": ".manifest"}
+
+def main(argv=None):
     """Parses, opens and extracts samples from a tracker module file."""
 
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in COMMANDS:
+        command = getattr(import_module(COMMANDS[argv[0]], __package__), argv[0])
+        return command(argv[1:])
+
     parser = argparse.ArgumentParser()
-    parser.add_argument("mod", help="a valid MOD, S3M, IT or XM file", type=Path)
+    parser.add_argument("mod", nargs="+", type=Path,
+                        help="a valid MOD, S3M, IT or XM file (several with --manifest)")
     parser.add_argument("-o", "--output_dir", type=Path)
-
-    args = parser.parse_args()
-
-    with open(args.mod, "rb") as file:
-        if args.output_dir:
-            output_dir = Path(Path.cwd(), args.output_dir).resolve()
-            if not Path(output_dir).is_dir():
-                raise NotADirectoryError("Output directory does not exist.")
-        else:
-            output_dir = Path(Path.cwd())
-
-        mod_file = tracker.identify_module(file)
-        print("TITLE: " + mod_file.title)
-
-        for sample in mod_file.samples:
-            sample_file_name = ""
-            if sample["length"] > 0:
-                sample_file_name = str(sample["number"])
-                # ???: do we still need this, if we're also using re.sub below?
-                sample["name"] = "".join(filter(lambda x: x in
-                                                set(string.printable),
-                                                sample["name"]))
-                if sample["name"] != "" and not sample["name"].isspace():
-                    sample_file_name += " - " + sample["name"].strip()
-
-                # remove chars unfriendly to some filesystems (NTFS, etc)
-                # cracktro musicians love to include fancy chars in their sample names
-                sample_file_name = re.sub(r"[^\w\s\d-]", "_", sample_file_name)
-
-                sample_file_name += ".wav"
-
-                print("[Exporting Sample] " + sample_file_name)
-
-                output_path = output_dir / sample_file_name
-                out = wave.open(str(output_path), "wb")
-                out.setnchannels(1)
-                out.setsampwidth(sample["width"])
-                out.setframerate(sample["rate"])
-                out.writeframes(sample["data"])
-                out.close()
-
-                if sample["loop_type"] != tracker.LoopType.OFF:
-                    # construct sample chunk
-                    smpl_chunk = b"smpl"
-                    # chunk size
-                    smpl_chunk += int(36 + (1 * 24) + 0).to_bytes(4, "little")
-                    # manufacturer & product
-                    smpl_chunk += bytes(8)
-                    # sample period
-                    smpl_chunk += int(floor(1000000000 / sample["rate"])).to_bytes(4, "little")
-
-                    # TODO: figure me out
-                    # midi unity note, 60 = middle C
-                    smpl_chunk += int(60).to_bytes(4, "little")
-                    # midi pitch fraction
-                    smpl_chunk += bytes(4)
-
-                    # smpte format & offset
-                    smpl_chunk += bytes(8)
-                    # number of sampler loops (should always be 1)
-                    smpl_chunk += int(1).to_bytes(4, "little")
-                    # sampler data
-                    smpl_chunk += bytes(4)
-                    # sample loops
-                    # cue point ID
-                    smpl_chunk += bytes(4)
-                    # loop type
-                    if sample["loop_type"] in (tracker.LoopType.OFF,
-                                               tracker.LoopType.FORWARD):
-                        smpl_loop_type = 0
-                    elif sample["loop_type"] == tracker.LoopType.PING_PONG:
-                        smpl_loop_type = 1
-                    smpl_chunk += int(smpl_loop_type).to_bytes(4, "little")
-                    # loop start
-                    smpl_chunk += int(sample["loop_start"]).to_bytes(4, "little")
-                    # loop end
-                    smpl_chunk += int(sample["loop_end"] - 1).to_bytes(4, "little")
-                    # fration, play count
-                    smpl_chunk += bytes(8)
-
-                    with open(output_path, "ab") as file:
-                        file.write(smpl_chunk)
-
-                    # if we add a smpl chunk, we need to update the ChunkSize
-                    file_size = Path(output_path).stat().st_size
-                    with open(output_path, "r+b") as file:
-                        file.seek(4)
-                        # ChunkSize doesn't count "RIFF" or itself
-                        file.write((file_size - 8).to_bytes(4, "little"))
+    parser.add_argument("-u", "--used-only", action="store_true",
+                        help="only export samples the song's patterns play")
+    parser.add_argument("-m", "--manifest", action="store_true",
+                        help="instead of writing WAVs, print a manifest of each "
+                             "sample's metadata & PCM hash")
+    parser.add_argument("-r", "--root", type=Path,
+                        help="give module paths in the manifest relative to this "
+                             "directory, rather than the current one")
+
+    args = parser.parse_args(argv)
+
+    if args.manifest:
+        try:
+            return write_manifest(args.mod, sys.stdout, args.used_only, args.root)
+        except BrokenPipeError:
+            # whoever was reading the manifest has gone away, e.g. head, so
+            # stop quietly, pointing stdout elsewhere for Python's final flush
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 1
+    if len(args.mod) > 1:
+        parser.error("only one module can be ripped at a time without --manifest")
+    args.mod = args.mod[0]
+
+    if args.output_dir:
+        output_dir = Path(Path.cwd(), args.output_dir).resolve()
+        if not Path(output_dir).is_dir():
+            raise NotADirectoryError("Output directory does not exist.")
+    else:
+        output_dir = Path(Path.cwd())
+
+    # pylint: disable=import-outside-toplevel
+    from .ripper import rip
+    from .sink import DirectorySink
+
+    rip(args.mod, DirectorySink(output_dir, log=print), used_only=args.used_only)
+
+def write_manifest(mods, out, used_only=False, root=None) -> int:
+    """
+    Writes a manifest of every sample in mods to out, with their paths
+    relative to root. Modules that can't be ripped are recorded as errors, and
+    make this return 1 rather than 0. Errors writing to out are raised.
+    """
+    # pylint: disable=import-outside-toplevel
+    from .manifest import ManifestWriteError
+    from .ripper import rip
+    from .sink import ManifestSink
+
+    failed = False
+    try:
+        with ManifestSink(out, root) as sink:
+            for mod in mods:
+                try:
+                    rip(mod, sink, used_only=used_only)
+                except ManifestWriteError:
+                    raise
+                # keep going, so one bad module doesn't spoil a whole corpus
+                except Exception as error: # pylint: disable=broad-except
+                    sink.write_error(mod, error)
+                    failed = True
+    except ManifestWriteError as error:
+        # it's the manifest's fault, not the module's
+        raise error.__cause__ from None
+
+    return 1 if failed else 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Manifests record every sample's metadata & a hash of its converted PCM data,
+one JSON object per line, so that rips can be verified without writing audio.
+
+Records are keyed by their module's path, relative to a root directory, and
+sample number. They also carry a hash of the module file, so the same module
+can still be matched up if it's found at a different path. They're written by
+trackrip.sink.ManifestSink.
+"""
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+# fields compared between manifests, besides the module & sample number
+RECORD_FIELDS = ("title", "name", "length", "width", "rate", "loop_type",
+                 "loop_start", "loop_end", "pcm_length", "hash", "error")
+
+def describe_sample(sample) -> dict:
+    """Returns a JSON friendly dict of sample's metadata."""
+    return {
+        "number": sample["number"],
+        "name": sample["name"],
+        "length": sample["length"],
+        "width": sample["width"],
+        "rate": sample["rate"],
+        "loop_type": sample["loop_type"].name,
+        "loop_start": sample["loop_start"],
+        "loop_end": sample["loop_end"],
+    }
+
+def get_module_name(path, root=None) -> str:
+    """
+    Returns the name a manifest gives the module at path, which is relative to
+    root (the current directory by default) where possible.
+    """
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(Path(root or Path.cwd()).resolve()).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+def hash_module(file) -> str:
+    """Returns a hash of all of file's contents, leaving its position alone."""
+    position = file.tell()
+    file.seek(0)
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in iter(lambda: file.read(1024 * 1024), b""):
+        digest.update(chunk)
+    file.seek(position)
+    return digest.hexdigest()
+
+class ManifestWriteError(Exception):
+    """
+    Raised when a manifest's records can't be written, with the OSError that
+    caused it as its __cause__, so it can't be mistaken for a module's error.
+    """
+
+def read_manifest(path) -> dict:
+    """Returns the records in the manifest at path, keyed by (module, number)."""
+    records = {}
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                records[(record["module"], record["number"])] = record
+    return records
+
+def match_moved_modules(old, new) -> dict:
+    """
+    Returns a dict mapping the names of modules only found in the new
+    manifest's records to the name of the same module, going by its hash, in
+    the old manifest's records.
+    """
+    old_hashes = {record["module"]: record.get("module_hash") for record in old.values()}
+    new_hashes = {record["module"]: record.get("module_hash") for record in new.values()}
+
+    # modules that only the old manifest has, by their hash
+    unmatched = {}
+    for module, module_hash in sorted(old_hashes.items()):
+        if module not in new_hashes and module_hash:
+            unmatched.setdefault(module_hash, []).append(module)
+
+    moved = {}
+    for module, module_hash in sorted(new_hashes.items()):
+        if module not in old_hashes and unmatched.get(module_hash):
+            moved[module] = unmatched[module_hash].pop(0)
+    return moved
+
+def compare_manifests(old, new) -> list:
+    """
+    Compares two manifests' records, returning a line describing each
+    difference between them. Modules are matched by path first, then by hash.
+    """
+    moved = match_moved_modules(old, new)
+    new = {(moved.get(module, module), number): record
+           for (module, number), record in new.items()}
+
+    def describe(key):
+        module, number = key
+        return module if number is None else "{} #{}".format(module, number)
+
+    def sort_key(key):
+        module, number = key
+        return module, -1 if number is None else number
+
+    differences = []
+    for key in sorted(old.keys() | new.keys(), key=sort_key):
+        if key not in new:
+            differences.append("- {}".format(describe(key)))
+        elif key not in old:
+            differences.append("+ {}".format(describe(key)))
+        else:
+            for field in RECORD_FIELDS:
+                if old[key].get(field) != new[key].get(field):
+                    differences.append("~ {}: {} {!r} -> {!r}".format(
+                        describe(key), field, old[key].get(field), new[key].get(field)))
+    return differences
+
+def compare(argv=None):
+    """Prints the differences between two manifests."""
+
+    parser = argparse.ArgumentParser(prog="trackrip compare")
+    parser.add_argument("old", type=Path, help="the manifest to compare against")
+    parser.add_argument("new", type=Path, help="the manifest to check")
+
+    args = parser.parse_args(argv)
+
+    differences = compare_manifests(read_manifest(args.old), read_manifest(args.new))
+    for difference in differences:
+        print(difference)
+    print("{} difference(s) found.".format(len(differences)))
+
+    return 1 if differences else 0
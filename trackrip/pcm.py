@@ -1,5 +1,10 @@
 """For modifying PCM data."""
-import struct
+from array import array
+from itertools import accumulate, chain
+import sys
+
+# maps every unsigned byte to its sign flipped counterpart, see below
+_SIGN_FLIP_TABLE = bytes((byte + 128) % 256 for byte in range(256))
 
 def signed_to_unsigned_8bit(data):
     """
@@ -16,34 +21,49 @@ def signed_to_unsigned_8bit(data):
     # their relative position will change again. 127 is position 255 while
     # signed, and 127 while unsigned. We add 128 and arrive at 255, the correct
     # position.
-    converted = bytearray()
-    for byte in data:
-        if byte > 127:
-            signed = byte - 128
-        else:
-            signed = byte + 128
-        converted.append(signed)
-    return converted
+    return bytearray(data).translate(_SIGN_FLIP_TABLE)
 
-def decode_delta_encoding_8bit(data) -> bytearray:
-    """Decodes an array of bytes stored as 8-bit delta values."""
-    delta_data = bytearray(len(data))
-    old = 0
-    for i in range(len(data)):
-        new = (data[i] + old) % 256
-        delta_data[i] = new
-        old = new
-    return delta_data
+def decode_delta_encoding_8bit(data, old=0) -> bytearray:
+    """
+    Decodes an array of bytes stored as 8-bit delta values, starting from the
+    value old.
+    """
+    # the first value accumulated is old itself, which isn't part of the output
+    delta_data = bytearray(value & 0xFF for value in accumulate(chain((old,), data)))
+    return delta_data[1:]
 
-def decode_delta_encoding_16bit(data) -> bytearray:
-    """Decodes an array of bytes stored as 16-bit delta values."""
-    delta_data = bytearray(len(data))
-    old = 0
-    for i in range(len(data) // 2):
-        current_bytes = data[i*2:(i*2)+2]
-        new = (struct.unpack("<H", current_bytes)[0] + old) % 65536
-        new_split = struct.unpack("<BB", new.to_bytes(2, "little"))
-        delta_data[i*2], delta_data[(i*2)+1] = new_split
-        old = new
-    return delta_data
+def decode_delta_encoding_16bit(data, old=0) -> bytearray:
+    """
+    Decodes an array of bytes stored as little-endian 16-bit delta values,
+    starting from the value old.
+    """
+    deltas = array("H")
+    deltas.frombytes(bytes(data[:len(data) // 2 * 2]))
+    if sys.byteorder == "big":
+        deltas.byteswap()
+    delta_data = array("H", (value & 0xFFFF for value in accumulate(chain((old,), deltas))))
+    del delta_data[0]
+    if sys.byteorder == "big":
+        delta_data.byteswap()
+    # any odd byte left over at the end is zeroed, as it can't be a whole value
+    return bytearray(delta_data.tobytes()) + bytes(len(data) % 2)
 
+def decode_chunks(chunks, width, delta=False, flip_sign=False):
+    """
+    Converts consecutive chunks of raw sample data, yielding each one ready to
+    be written to a WAV file. Delta decoding carries on from where the previous
+    chunk left off, so a sample can be converted without ever holding all of it.
+    16-bit chunks should have an even length, except for the last.
+    """
+    old = 0
+    for chunk in chunks:
+        if delta and chunk:
+            if width == 16//8:
+                chunk = decode_delta_encoding_16bit(chunk, old)
+                old = int.from_bytes(chunk[-2:], "little") if len(chunk) > 1 else old
+            else:
+                chunk = decode_delta_encoding_8bit(chunk, old)
+                old = chunk[-1]
+        if flip_sign:
+            chunk = signed_to_unsigned_8bit(chunk)
+        yield chunk
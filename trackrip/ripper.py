@@ -0,0 +1,30 @@
+"""Rips the samples in a tracker module into a sink."""
+from pathlib import Path
+
+from . import tracker
+
+def rip(source, sink, used_only=False, chunk_size=tracker.CHUNK_SIZE):
+    """
+    Rips every sample in source, a path or binary file object holding a
+    tracker module, into sink. If used_only is set, samples the module's
+    patterns never play are skipped without being read.
+    Sample data is streamed into the sink chunk_size bytes at a time.
+    Returns the module object that was ripped.
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as file:
+            return rip(file, sink, used_only, chunk_size)
+
+    mod_file = tracker.identify_module(source, load_samples=False)
+    sink.begin_module(mod_file)
+
+    used_samples = mod_file.find_used_samples() if used_only else None
+
+    for sample in mod_file.samples:
+        if used_samples is not None and sample["number"] not in used_samples:
+            continue
+        if sample["length"] > 0:
+            data = mod_file.read_sample_data(sample, chunk_size)
+            sink.write_sample(sample, (memoryview(chunk) for chunk in data))
+
+    return mod_file
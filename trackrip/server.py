@@ -0,0 +1,258 @@
+"""
+Keeps a pool of warm workers around to rip many modules without paying for
+interpreter startup and imports on every file.
+
+Jobs are JSON objects, one per line, e.g.
+    {"id": 1, "input": "song.mod", "output": "samples/", "used_only": false}
+and every job gets back a single JSON line tagged with the same id, listing
+the samples that were written along with their metadata. Jobs with
+"manifest": true write no audio, and get back the module's manifest records.
+"""
+
+import argparse
+import json
+import os
+import queue
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from pathlib import Path
+
+def serve(argv=None):
+    """Runs the server, reading jobs from stdin or a Unix socket."""
+
+    parser = argparse.ArgumentParser(prog="trackrip serve")
+    parser.add_argument("-s", "--socket", type=Path,
+                        help="listen on this Unix socket instead of stdin")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(),
+                        help="number of worker processes to keep warm")
+
+    args = parser.parse_args(argv)
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=warm_up) as pool:
+        # start every worker now, rather than on the first few jobs
+        wait([pool.submit(warm_up) for _ in range(args.workers or 1)])
+
+        if not args.socket:
+            handle_jobs(sys.stdin, sys.stdout, pool)
+            return
+
+        if args.socket.exists():
+            raise FileExistsError("Socket path already exists.")
+
+        # open client connections, so they can be hung up on when we stop
+        connections = set()
+        connections_lock = threading.Lock()
+
+        class JobHandler(socketserver.StreamRequestHandler):
+            """Reads jobs from a single client connection."""
+            def setup(self):
+                super().setup()
+                with connections_lock:
+                    connections.add(self.request)
+
+            def handle(self):
+                lines = (line.decode("utf-8", "replace") for line in self.rfile)
+                writer = _SocketWriter(self.wfile)
+                handle_jobs(lines, writer, pool)
+
+            def finish(self):
+                with connections_lock:
+                    connections.discard(self.request)
+                super().finish()
+
+        # stop on SIGTERM just like Ctrl+C, so the socket gets cleaned up
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+        with socketserver.ThreadingUnixStreamServer(str(args.socket), JobHandler) as server:
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                args.socket.unlink()
+                # handlers waiting on idle clients would keep server_close()
+                # from returning, so cut every client off
+                with connections_lock:
+                    for connection in connections:
+                        try:
+                            connection.shutdown(socket.SHUT_RDWR)
+                        except OSError:
+                            pass
+
+def submit(argv=None):
+    """Sends modules to a running server and prints its replies."""
+
+    parser = argparse.ArgumentParser(prog="trackrip submit")
+    parser.add_argument("mod", nargs="+", type=Path,
+                        help="valid MOD, S3M, IT or XM files")
+    parser.add_argument("-s", "--socket", type=Path, required=True,
+                        help="the Unix socket the server is listening on")
+    parser.add_argument("-o", "--output_dir", type=Path)
+    parser.add_argument("-u", "--used-only", action="store_true",
+                        help="only export samples the song's patterns play")
+    parser.add_argument("-m", "--manifest", action="store_true",
+                        help="instead of writing WAVs, print a manifest of each "
+                             "sample's metadata & PCM hash")
+    parser.add_argument("-r", "--root", type=Path,
+                        help="give module paths in the manifest relative to this "
+                             "directory, rather than the current one")
+
+    args = parser.parse_args(argv)
+
+    # pylint: disable=import-outside-toplevel
+    from .manifest import get_module_name
+
+    # the server doesn't share our working directory
+    output_dir = (args.output_dir or Path.cwd()).resolve()
+
+    failed = False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(args.socket))
+        for i, mod in enumerate(args.mod):
+            job = {"id": i, "input": str(mod.resolve()), "output": str(output_dir),
+                   "used_only": args.used_only, "manifest": args.manifest}
+            client.sendall((json.dumps(job) + "\n").encode("utf-8"))
+        client.shutdown(socket.SHUT_WR)
+
+        with client.makefile("r", encoding="utf-8") as replies:
+            for line in replies:
+                reply = json.loads(line)
+                failed = failed or not reply["ok"]
+                if not args.manifest:
+                    print(line, end="")
+                    continue
+
+                # name modules relative to our root, like a local manifest
+                mod_name = get_module_name(args.mod[reply["id"]], args.root)
+                if not reply["ok"]:
+                    reply["manifest"] = [{"module": mod_name, "module_hash": None,
+                                          "number": None, "error": reply["error"]}]
+                for record in reply["manifest"]:
+                    record["module"] = mod_name
+                    print(json.dumps(record))
+
+    return 1 if failed else 0
+
+def handle_jobs(lines, out, pool):
+    """
+    Submits every job read from lines to pool, writing each reply to out as
+    soon as its job finishes. Returns once all jobs have been answered, or the
+    client has gone away.
+    """
+    # replies are only ever written from this thread, so a client that stops
+    # reading holds up nobody's replies but its own
+    results = queue.Queue()
+    futures = []
+    disconnected = threading.Event()
+    reader = threading.Thread(target=read_jobs,
+                              args=(lines, pool, results, futures, disconnected),
+                              daemon=True)
+    reader.start()
+
+    job_count = None
+    answered = 0
+    while job_count is None or answered < job_count:
+        result = results.get()
+        if isinstance(result, int): # the reader's done, and sent this many
+            job_count = result
+            continue
+        answered += 1
+
+        if disconnected.is_set():
+            continue
+        if isinstance(result, dict):
+            message = result
+        else:
+            job_id, future = result
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error:
+                message = {"id": job_id, "ok": False,
+                           "error": "{}: {}".format(type(error).__name__, error)}
+            else:
+                message = dict({"id": job_id, "ok": True}, **future.result())
+
+        try:
+            out.write(json.dumps(message) + "\n")
+            out.flush()
+        except OSError:
+            # nobody's listening, so don't bother with the rest of the jobs
+            disconnected.set()
+            for future in list(futures):
+                future.cancel()
+
+def read_jobs(lines, pool, results, futures, disconnected):
+    """
+    Submits every job read from lines to pool, putting each one's future on
+    results when it's done. Malformed jobs get their reply put on results
+    straight away. Finally, puts the number of replies to expect.
+    """
+    count = 0
+    try:
+        for line in lines:
+            if disconnected.is_set():
+                break
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+                job_id = job.get("id")
+            except (ValueError, AttributeError) as error:
+                results.put({"id": None, "ok": False,
+                             "error": "Malformed job: {}".format(error)})
+                count += 1
+                continue
+            future = pool.submit(run_job, job)
+            futures.append(future)
+            count += 1
+            future.add_done_callback(
+                lambda future, job_id=job_id: results.put((job_id, future)))
+    except OSError:
+        pass # the client hung up mid-job, so stop reading
+    finally:
+        results.put(count)
+
+def warm_up():
+    """Imports everything a job needs, so the first job doesn't pay for it."""
+    # leave Ctrl+C to the server, which shuts the pool down cleanly
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # pylint: disable=import-outside-toplevel,unused-import
+    from . import manifest, ripper, sink
+
+def run_job(job) -> dict:
+    """Rips a single job's module, returning its title and sample metadata."""
+    # pylint: disable=import-outside-toplevel
+    from .manifest import describe_sample
+    from .ripper import rip
+    from .sink import DirectorySink, ManifestSink
+
+    if job.get("manifest"):
+        sink = ManifestSink()
+        mod_file = rip(job["input"], sink, used_only=bool(job.get("used_only")))
+        return {"title": mod_file.title, "manifest": sink.records}
+
+    sink = DirectorySink(job.get("output") or Path.cwd())
+    mod_file = rip(job["input"], sink, used_only=bool(job.get("used_only")))
+
+    samples = []
+    for sample, output_path in sink.exported:
+        samples.append(dict(describe_sample(sample), file=str(output_path)))
+
+    return {"title": mod_file.title, "samples": samples}
+
+class _SocketWriter:
+    """Adapts a socket's binary file object to the text writes handle_jobs makes."""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, text):
+        self.wfile.write(text.encode("utf-8"))
+
+    def flush(self):
+        self.wfile.flush()
@@ -0,0 +1,289 @@
+"""
+Destinations for samples ripped with trackrip.rip().
+
+A sink is told about each module before its samples with begin_module(), then
+handed every sample with write_sample(). A sample arrives as its header dict
+along with its data, an iterable of memoryviews over consecutive chunks of
+converted PCM, which are only valid until the next chunk is requested.
+"""
+from pathlib import Path
+import time
+
+from . import wav
+
+class Sink:
+    """Base class for sinks, which ignores everything it's given."""
+
+    def begin_module(self, module):
+        """Called with each module object, before any of its samples."""
+
+    def write_sample(self, sample, data):
+        """Called with each sample's header dict and chunks of PCM data."""
+        for _ in data:
+            pass
+
+    def close(self):
+        """Finishes writing, once every module has been ripped."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class DirectorySink(Sink):
+    """Writes each sample to a WAV file in a directory."""
+
+    def __init__(self, output_dir, log=None):
+        self.output_dir = Path(output_dir)
+        if not self.output_dir.is_dir():
+            raise NotADirectoryError("Output directory does not exist.")
+        self.log = log
+        # (sample, output path) of every sample written so far
+        self.exported = []
+
+    def begin_module(self, module):
+        if self.log:
+            self.log("TITLE: " + module.title)
+
+    def write_sample(self, sample, data):
+        sample_file_name = wav.get_file_name(sample)
+        if self.log:
+            self.log("[Exporting Sample] " + sample_file_name)
+
+        output_path = self.output_dir / sample_file_name
+        smpl_chunk = wav.build_smpl_chunk(sample)
+        with open(output_path, "wb") as file:
+            file.write(wav.build_header(sample, sample["length"], len(smpl_chunk)))
+            data_length = 0
+            for chunk in data:
+                file.write(chunk)
+                data_length += len(chunk)
+            file.write(smpl_chunk)
+
+            # truncated modules can leave us with less data than expected
+            if data_length != sample["length"]:
+                file.seek(0)
+                file.write(wav.build_header(sample, data_length, len(smpl_chunk)))
+
+        self.exported.append((sample, output_path))
+
+class _ModuleEntrySink(Sink):
+    """
+    Base class for sinks that collect samples from any number of modules as
+    named entries. Each module's entries are put under a directory named
+    after the module's file, so samples from different modules can't clash.
+    """
+
+    def __init__(self):
+        self.module_names = set()
+        self.module_name = None
+
+    def begin_module(self, module):
+        file_name = getattr(module.file, "name", None)
+        if isinstance(file_name, str):
+            base_name = Path(file_name).stem
+        else:
+            base_name = "module"
+
+        module_name = base_name
+        count = 1
+        while module_name in self.module_names:
+            count += 1
+            module_name = "{} ({})".format(base_name, count)
+        self.module_names.add(module_name)
+        self.module_name = module_name
+
+    def get_entry_name(self, sample) -> str:
+        """Returns the name of sample's WAV file within the sink."""
+        return "{}/{}".format(self.module_name, wav.get_file_name(sample))
+
+class MemorySink(_ModuleEntrySink):
+    """
+    Keeps each sample's WAV file in memory, in files, keyed by
+    "<module>/<file name>".
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.files = {}
+
+    def write_sample(self, sample, data):
+        smpl_chunk = wav.build_smpl_chunk(sample)
+        pcm_data = b"".join(data)
+        self.files[self.get_entry_name(sample)] = b"".join([
+            wav.build_header(sample, len(pcm_data), len(smpl_chunk)),
+            pcm_data,
+            smpl_chunk,
+        ])
+
+class CallbackSink(Sink):
+    """Calls callback(sample, data) for each sample, with the sink's arguments."""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def write_sample(self, sample, data):
+        self.callback(sample, data)
+
+class TarSink(_ModuleEntrySink):
+    """
+    Streams each sample's WAV file into a tar archive written to fileobj,
+    which doesn't need to be seekable. Files are named "<module>/<file name>".
+    """
+
+    def __init__(self, fileobj):
+        super().__init__()
+        self.fileobj = fileobj
+
+    def write_sample(self, sample, data):
+        import tarfile # pylint: disable=import-outside-toplevel
+
+        smpl_chunk = wav.build_smpl_chunk(sample)
+
+        info = tarfile.TarInfo(self.get_entry_name(sample))
+        info.size = 44 + sample["length"] + len(smpl_chunk)
+        info.mtime = int(time.time())
+        self.fileobj.write(info.tobuf(tarfile.GNU_FORMAT))
+
+        self.fileobj.write(wav.build_header(sample, sample["length"], len(smpl_chunk)))
+        for chunk in pad_data(sample, data):
+            self.fileobj.write(chunk)
+        self.fileobj.write(smpl_chunk)
+
+        # members are padded out to a whole block
+        remainder = info.size % tarfile.BLOCKSIZE
+        if remainder:
+            self.fileobj.write(bytes(tarfile.BLOCKSIZE - remainder))
+
+    def close(self):
+        import tarfile # pylint: disable=import-outside-toplevel
+
+        # the end of an archive is marked by two empty blocks
+        self.fileobj.write(bytes(tarfile.BLOCKSIZE * 2))
+        self.fileobj.flush()
+
+class ZipSink(_ModuleEntrySink):
+    """
+    Streams each sample's WAV file into a zip archive written to fileobj,
+    which doesn't need to be seekable. Files are named "<module>/<file name>".
+    compression is one of zipfile's constants, and defaults to ZIP_STORED.
+    """
+
+    def __init__(self, fileobj, compression=None):
+        import zipfile # pylint: disable=import-outside-toplevel
+
+        super().__init__()
+        if compression is None:
+            compression = zipfile.ZIP_STORED
+        self.archive = zipfile.ZipFile(fileobj, "w", compression)
+
+    def write_sample(self, sample, data):
+        import zipfile # pylint: disable=import-outside-toplevel
+
+        smpl_chunk = wav.build_smpl_chunk(sample)
+
+        info = zipfile.ZipInfo(self.get_entry_name(sample), time.localtime()[:6])
+        info.compress_type = self.archive.compression
+        info.file_size = 44 + sample["length"] + len(smpl_chunk)
+        with self.archive.open(info, "w") as member:
+            member.write(wav.build_header(sample, sample["length"], len(smpl_chunk)))
+            for chunk in pad_data(sample, data):
+                member.write(chunk)
+            member.write(smpl_chunk)
+
+    def close(self):
+        self.archive.close()
+
+class ManifestSink(Sink):
+    """
+    Writes a manifest record for each sample to out, a text file. If out is
+    None, records are kept in records instead. Module paths are given relative
+    to root, the current directory by default. Modules read from a file object
+    without a path are named by their hash.
+    """
+
+    def __init__(self, out=None, root=None):
+        self.out = out
+        self.root = root
+        self.records = []
+        self.module_name = None
+        self.module_hash = None
+        self.title = None
+
+    def begin_module(self, module):
+        # pylint: disable=import-outside-toplevel
+        from .manifest import get_module_name, hash_module
+
+        self.module_hash = hash_module(module.file)
+        file_name = getattr(module.file, "name", None)
+        if isinstance(file_name, str):
+            self.module_name = get_module_name(file_name, self.root)
+        else:
+            self.module_name = self.module_hash
+        self.title = module.title
+
+    def write_sample(self, sample, data):
+        # pylint: disable=import-outside-toplevel
+        import hashlib
+        from .manifest import describe_sample
+
+        digest = hashlib.blake2b(digest_size=16)
+        pcm_length = 0
+        for chunk in data:
+            digest.update(chunk)
+            pcm_length += len(chunk)
+
+        record = {"module": self.module_name, "module_hash": self.module_hash,
+                  "title": self.title}
+        record.update(describe_sample(sample))
+        record["pcm_length"] = pcm_length
+        record["hash"] = digest.hexdigest()
+        self.write_record(record)
+
+    def write_error(self, path, error):
+        """Records that the module at path couldn't be ripped."""
+        # pylint: disable=import-outside-toplevel
+        from .manifest import get_module_name, hash_module
+
+        try:
+            with open(path, "rb") as file:
+                module_hash = hash_module(file)
+        except OSError:
+            module_hash = None
+        self.write_record({"module": get_module_name(path, self.root),
+                           "module_hash": module_hash, "number": None,
+                           "error": "{}: {}".format(type(error).__name__, error)})
+
+    def write_record(self, record):
+        """Writes a single record to the manifest."""
+        # pylint: disable=import-outside-toplevel
+        import json
+        from .manifest import ManifestWriteError
+
+        if self.out is None:
+            self.records.append(record)
+        else:
+            try:
+                self.out.write(json.dumps(record) + "\n")
+            except OSError as error:
+                raise ManifestWriteError("Couldn't write manifest record.") from error
+
+    def close(self):
+        if self.out is not None:
+            self.out.flush()
+
+def pad_data(sample, data):
+    """
+    Yields data's chunks, then silence to make up any difference from the
+    length in sample's header. Archives need to know each file's size before
+    its data, but truncated modules can leave us with less data than expected.
+    """
+    data_length = 0
+    for chunk in data:
+        data_length += len(chunk)
+        yield chunk
+    if data_length < sample["length"]:
+        # 8-bit WAV data is unsigned, so silence is in the middle
+        silence = b"\x80" if sample["width"] == 1 else b"\x00"
+        yield silence * (sample["length"] - data_length)
@@ -13,39 +13,93 @@ class LoopType(Enum):
     FORWARD = 1
     PING_PONG = 2
 
-def identify_module(file) -> str:
+# how much sample data is read & converted at once when streaming
+CHUNK_SIZE = 64 * 1024
+
+def identify_module(file, load_samples=True) -> str:
     """
     Determines the format of the module file provided and returns it as an
     appropriate object.
+    If load_samples is False, sample data is left in the file to be streamed
+    with the object's read_sample_data().
     """
     magic = file.read(17)
     if magic[:4] == b"IMPM":
-        return ImpulseTrackerIT(file)
+        return ImpulseTrackerIT(file, load_samples)
     if magic[:8] == b"ziRCONia":
         raise NotImplementedError("MMCMP-compression isn't supported.")
     if magic[:4] == b"\xC1\x83\x2A\x9E":
-        return UnrealEngineUMX(file)
+        return UnrealEngineUMX(file, load_samples)
     if magic[:17] == b"Extended Module: ":
-        return FastTracker2XM(file)
+        return FastTracker2XM(file, load_samples)
 
     file.seek(28)
     sig_one = file.read(2)
     file.seek(44)
     sig_two = file.read(4)
     if sig_one == b"\x1A\x10" and sig_two == b'SCRM':
-        return ScreamTracker3S3M(file)
+        return ScreamTracker3S3M(file, load_samples)
+
+    return ProtrackerMOD(file, load_samples)
+
+class TrackerModule:
+    """
+    Reads sample data for the module formats below, which describe where each
+    sample's data lives and how to convert it in the sample's "pointer",
+    "length", "width", "delta" & "flip_sign" entries.
+    """
 
-    return ProtrackerMOD(file)
+    def __init__(self, file):
+        self.file = file
+        self.title = ""
+        self.samples = []
 
-class ProtrackerMOD:
+    def read_sample_data(self, sample, chunk_size=CHUNK_SIZE):
+        """
+        Yields sample's data converted for a WAV file, reading and converting
+        no more than chunk_size bytes at a time.
+        """
+        # keep 16-bit values from being split across two chunks
+        chunk_size = max(chunk_size - chunk_size % sample["width"], sample["width"])
+        chunks = self.read_raw_chunks(sample["pointer"], sample["length"], chunk_size)
+        return pcm.decode_chunks(chunks, sample["width"],
+                                 sample["delta"], sample["flip_sign"])
+
+    def read_raw_chunks(self, pointer, length, chunk_size):
+        """Yields length bytes from pointer in the file, chunk_size at a time."""
+        position = pointer
+        end = pointer + length
+        while position < end:
+            # seek every time, in case something else moved the file along
+            self.file.seek(position)
+            chunk = self.file.read(min(chunk_size, end - position))
+            if not chunk: # truncated file
+                break
+            yield chunk
+            position += len(chunk)
+
+    def load_sample_data(self):
+        """Reads every sample's converted data into its "data" entry."""
+        for sample in self.samples:
+            if sample["length"] > 0:
+                sample["data"] = b"".join(self.read_sample_data(sample))
+
+    def find_used_samples(self) -> set:
+        """
+        Scans the patterns in the song's order list, and returns the numbers
+        of the samples they play.
+        """
+        raise NotImplementedError("Pattern scanning isn't supported for this format.")
+
+class ProtrackerMOD(TrackerModule):
     """Retrieves sample data from Protracker MOD files."""
 
     # Amiga Paula clock rate closest to 8372Hz C
     SAMPLE_RATE = 8363
     SAMPLE_WIDTH = 8 // 8
 
-    def __init__(self, file):
-        self.file = file
+    def __init__(self, file, load_samples=True):
+        super().__init__(file)
 
         self.file.seek(1080)
         self.identifier = self.file.read(4)
@@ -63,23 +117,33 @@ class ProtrackerMOD:
             sample = self.decode_sample_header(self.file.read(30))
             self.samples.append(sample)
 
-        self.file.seek(1, SEEK_CUR) # skip number of song positions
+        song_length = int.from_bytes(self.file.read(1), "big")
         self.file.seek(1, SEEK_CUR) # this byte can be ignored
 
-        pattern_count = self.find_highest_pattern(self.file.read(128))
+        pattern_table = self.file.read(128)
+        pattern_count = self.find_highest_pattern(pattern_table)
+        self.orders = list(pattern_table[:song_length])
 
         self.file.seek(4, SEEK_CUR) # we've already got the identifier
 
+        self.pattern_pointer = self.file.tell()
         for _ in range(pattern_count + 1): # skip pattern data
             self.file.seek(256 * self.get_channel_count(), SEEK_CUR)
 
+        # sample data is stored back to back after the patterns
+        pointer = self.file.tell()
         for i, sample in enumerate(self.samples):
             sample["number"] = i
             if sample["length"] > 0:
                 sample["rate"] = self.SAMPLE_RATE
                 sample["width"] = self.SAMPLE_WIDTH
-                sample["data"] = self.file.read(sample["length"])
-                sample["data"] = pcm.signed_to_unsigned_8bit(sample["data"])
+                sample["pointer"] = pointer
+                sample["delta"] = False
+                sample["flip_sign"] = True
+                pointer += sample["length"]
+
+        if load_samples:
+            self.load_sample_data()
 
     def get_sample_count(self) -> int:
         """Returns the # of samples present."""
@@ -138,11 +202,28 @@ class ProtrackerMOD:
                 last_pattern = pattern
         return last_pattern
 
-class ScreamTracker3S3M:
+    def find_used_samples(self) -> set:
+        """
+        Scans the patterns in the song's order list, and returns the numbers
+        of the samples they play.
+        """
+        pattern_size = 256 * self.get_channel_count()
+        used = set()
+        for pattern in set(self.orders):
+            self.file.seek(self.pattern_pointer + pattern * pattern_size)
+            pattern_data = self.file.read(pattern_size)
+            # each note is 4 bytes, with the sample number's upper nibble in
+            # the first byte and its lower nibble in the third
+            for upper, lower in zip(pattern_data[0::4], pattern_data[2::4]):
+                used.add((upper & 0xF0) | (lower >> 4))
+        used.discard(0)
+        return {number - 1 for number in used}
+
+class ScreamTracker3S3M(TrackerModule):
     """Retrieves sample data from ScreamTracker 3 S3M files."""
 
-    def __init__(self, file):
-        self.file = file
+    def __init__(self, file, load_samples=True):
+        super().__init__(file)
 
         self.file.seek(0)
         self.title = self.file.read(28).decode("ascii")
@@ -152,9 +233,10 @@ class ScreamTracker3S3M:
 
         order_count = int.from_bytes(self.file.read(2), "little")
         instrument_count = int.from_bytes(self.file.read(2), "little")
+        pattern_count = int.from_bytes(self.file.read(2), "little")
 
-        # skip patternPtrCount, flags, trackVersion
-        self.file.seek(6, SEEK_CUR)
+        # skip flags, trackVersion
+        self.file.seek(4, SEEK_CUR)
 
         sample_type = int.from_bytes(self.file.read(2), "little")
         signed = bool(sample_type == 1)
@@ -162,8 +244,8 @@ class ScreamTracker3S3M:
         # skip sig2, globalVolume, initialSpeed, initialTempo, masterVolume,
         # ultraClickRemoval, defaultPan, reserved, ptrSpecial, channelSettings
         self.file.seek(52, SEEK_CUR)
-        # skip orderList
-        self.file.seek(order_count, SEEK_CUR)
+        # 254 & 255 are markers, not patterns
+        self.orders = [order for order in self.file.read(order_count) if order < 254]
 
         instrument_pointers = []
         for _ in range(instrument_count):
@@ -171,6 +253,11 @@ class ScreamTracker3S3M:
             pointer = int.from_bytes(self.file.read(2), "little") * 16
             instrument_pointers.append(pointer)
 
+        self.pattern_pointers = []
+        for _ in range(pattern_count):
+            pointer = int.from_bytes(self.file.read(2), "little") * 16
+            self.pattern_pointers.append(pointer)
+
         self.samples = []
         for i, pointer in enumerate(instrument_pointers):
             self.file.seek(pointer)
@@ -181,11 +268,44 @@ class ScreamTracker3S3M:
                 self.samples.append(sample)
 
         for sample in self.samples:
-            self.file.seek(sample["pointer"])
-            if sample["length"] > 0:
-                sample["data"] = self.file.read(sample["length"])
-                if signed:
-                    sample["data"] = pcm.signed_to_unsigned_8bit(sample["data"])
+            sample["delta"] = False
+            sample["flip_sign"] = signed
+
+        if load_samples:
+            self.load_sample_data()
+
+    def find_used_samples(self) -> set:
+        """
+        Scans the patterns in the song's order list, and returns the numbers
+        of the samples they play.
+        """
+        used = set()
+        for pattern in set(self.orders):
+            if pattern >= len(self.pattern_pointers) or not self.pattern_pointers[pattern]:
+                continue # missing patterns are empty
+            self.file.seek(self.pattern_pointers[pattern])
+            packed_length = int.from_bytes(self.file.read(2), "little")
+            pattern_data = self.file.read(packed_length)
+
+            i = 0
+            row = 0
+            while i < len(pattern_data) and row < 64:
+                what = pattern_data[i]
+                i += 1
+                if what == 0: # end of row
+                    row += 1
+                    continue
+                if what & 0b00100000: # note & instrument
+                    if i + 1 < len(pattern_data) and pattern_data[i + 1]:
+                        used.add(pattern_data[i + 1])
+                    i += 2
+                if what & 0b01000000: # volume
+                    i += 1
+                if what & 0b10000000: # command & info
+                    i += 2
+
+        # instruments are numbered from 1
+        return {instrument - 1 for instrument in used}
 
     @staticmethod
     def decode_sample_header(header_bytes) -> dict:
@@ -235,11 +355,11 @@ class ScreamTracker3S3M:
 
         return sample
 
-class ImpulseTrackerIT:
+class ImpulseTrackerIT(TrackerModule):
     """Retrieves sample data from Impulse Tracker IT files."""
 
-    def __init__(self, file):
-        self.file = file
+    def __init__(self, file, load_samples=True):
+        super().__init__(file)
 
         self.file.seek(4)
         self.title = self.file.read(26).decode("ascii")
@@ -250,14 +370,34 @@ class ImpulseTrackerIT:
         order_count = int.from_bytes(self.file.read(2), "little")
         instrument_count = int.from_bytes(self.file.read(2), "little")
         sample_count = int.from_bytes(self.file.read(2), "little")
+        pattern_count = int.from_bytes(self.file.read(2), "little")
+
+        # skip created with tracker & compatible with tracker
+        self.file.seek(4, SEEK_CUR)
+
+        flags = int.from_bytes(self.file.read(2), "little")
+        # if off, patterns play samples directly
+        self.use_instruments = bool(flags & 0b00000100)
+
+        self.file.seek(192)
+        # 254 & 255 are markers, not patterns
+        self.orders = [order for order in self.file.read(order_count) if order < 254]
 
-        self.file.seek(192 + order_count + (instrument_count * 4))
+        self.instrument_pointers = []
+        for _ in range(instrument_count):
+            pointer = int.from_bytes(self.file.read(4), "little")
+            self.instrument_pointers.append(pointer)
 
         sample_header_pointers = []
         for _ in range(sample_count):
             pointer = int.from_bytes(self.file.read(4), "little")
             sample_header_pointers.append(pointer)
 
+        self.pattern_pointers = []
+        for _ in range(pattern_count):
+            pointer = int.from_bytes(self.file.read(4), "little")
+            self.pattern_pointers.append(pointer)
+
         self.samples = []
         for i, pointer in enumerate(sample_header_pointers):
             self.file.seek(pointer)
@@ -267,19 +407,113 @@ class ImpulseTrackerIT:
 
         for sample in self.samples:
             if sample["length"] > 0:
-                self.file.seek(sample["pointer"])
-                sample_data = self.file.read(sample["length"])
-                if not sample["compressed"]:
-                    sample["data"] = sample_data
-                else:
-                    sample["data"] = self.decompress_it_sample(sample_data)
+                if sample["compressed"]:
+                    raise NotImplementedError("IT214 sample compression isn't supported yet.")
+                sample["delta"] = False
                 # python's wave module always outputs 8-bit samples as unsigned,
                 # and 16-bit samples as signed.
-                if sample["signed"] and sample["width"] == 1:
-                    sample["data"] = pcm.signed_to_unsigned_8bit(sample["data"])
-                elif not sample["signed"] and sample["width"] == 2:
+                sample["flip_sign"] = sample["signed"] and sample["width"] == 1
+                if not sample["signed"] and sample["width"] == 2:
                     raise NotImplementedError("Unsigned 16-bit samples aren't supported yet.")
 
+        if load_samples:
+            self.load_sample_data()
+
+    def find_used_samples(self) -> set:
+        """
+        Scans the patterns in the song's order list, and returns the numbers
+        of the samples they play.
+        """
+        # pairs of (instrument, note) that are actually played
+        played = set()
+        # notes without an instrument play the channel's last one, even if it
+        # was set in an earlier pattern, so follow the order list in sequence
+        channel_instruments = [0] * 64
+        patterns = {}
+        for pattern in self.orders:
+            if pattern >= len(self.pattern_pointers) or not self.pattern_pointers[pattern]:
+                continue # missing patterns are empty
+            if pattern not in patterns:
+                self.file.seek(self.pattern_pointers[pattern])
+                packed_length = int.from_bytes(self.file.read(2), "little")
+                # skip rows & reserved
+                self.file.seek(6, SEEK_CUR)
+                patterns[pattern] = self.file.read(packed_length)
+            played |= self.decode_played_notes(patterns[pattern], channel_instruments)
+
+        used = set()
+        if not self.use_instruments:
+            # "instruments" in the patterns are sample numbers
+            used = {instrument for instrument, _ in played}
+        else:
+            keyboards = {}
+            for instrument, note in played:
+                if instrument > len(self.instrument_pointers):
+                    continue
+                if instrument not in keyboards:
+                    # note-sample keyboard table, 120 pairs of (note, sample)
+                    self.file.seek(self.instrument_pointers[instrument - 1] + 0x40)
+                    keyboards[instrument] = self.file.read(240)
+                keyboard = keyboards[instrument]
+                if note * 2 + 1 < len(keyboard):
+                    used.add(keyboard[note * 2 + 1])
+        used.discard(0)
+
+        # samples are numbered from 1
+        return {sample - 1 for sample in used}
+
+    @staticmethod
+    def decode_played_notes(pattern_data, channel_instruments) -> set:
+        """
+        Decodes packed pattern data, returning a set of (instrument, note)
+        pairs for every note played.
+        channel_instruments holds the instrument each of the 64 channels last
+        played, and is updated as the pattern sets new ones.
+        """
+        # values for each channel that packed notes can refer back to, which
+        # start afresh with every pattern
+        last_mask = [0] * 64
+        last_note = [0] * 64
+        last_instrument = [0] * 64
+
+        played = set()
+        i = 0
+        try:
+            while i < len(pattern_data):
+                channel_variable = pattern_data[i]
+                i += 1
+                if channel_variable == 0: # end of row
+                    continue
+                channel = (channel_variable - 1) & 63
+                if channel_variable & 0b10000000:
+                    last_mask[channel] = pattern_data[i]
+                    i += 1
+                mask = last_mask[channel]
+
+                note = None
+                if mask & 0b00000001:
+                    note = last_note[channel] = pattern_data[i]
+                    i += 1
+                if mask & 0b00000010:
+                    last_instrument[channel] = pattern_data[i]
+                    i += 1
+                if mask & 0b00000100: # volume
+                    i += 1
+                if mask & 0b00001000: # command & value
+                    i += 2
+                if mask & 0b00010000:
+                    note = last_note[channel]
+                if mask & 0b00100010 and last_instrument[channel]:
+                    channel_instruments[channel] = last_instrument[channel]
+
+                # 120 & above are note off, note cut & note fade
+                if note is not None and note < 120 and channel_instruments[channel]:
+                    played.add((channel_instruments[channel], note))
+        except IndexError:
+            pass # truncated pattern, keep what we've found
+
+        return played
+
     @staticmethod
     def decode_sample_header(header_bytes) -> dict:
         """Returns a dict of the sample's header data decoded from header_bytes."""
@@ -330,19 +564,14 @@ class ImpulseTrackerIT:
 
         return sample
 
-    @staticmethod
-    def decompress_it_sample(sample_bytes) -> bytes:
-        raise NotImplementedError("IT214 sample compression isn't supported yet.")
-
-class FastTracker2XM:
+class FastTracker2XM(TrackerModule):
     """Retrieves sample data from FastTracker 2 XM files."""
 
-    def __init__(self, file):
-            self.file = file
+    def __init__(self, file, load_samples=True):
+            super().__init__(file)
 
             self.file.seek(17)
             self.title = self.file.read(20).decode("ascii")
-            print(self.title)
 
             # skip 0x1A & tracker name
             self.file.seek(21, SEEK_CUR)
@@ -369,11 +598,15 @@ class FastTracker2XM:
             # skip restart position
             self.file.seek(2, SEEK_CUR)
 
-            channel_count = int.from_bytes(self.file.read(2), "little")
+            self.channel_count = int.from_bytes(self.file.read(2), "little")
             pattern_count = int.from_bytes(self.file.read(2), "little")
             instrument_count = int.from_bytes(self.file.read(2), "little")
             frequency_table_flag = int.from_bytes(self.file.read(2), "little")
 
+            # skip tempo & bpm
+            self.file.seek(4, SEEK_CUR)
+            self.orders = list(self.file.read(song_length))
+
             # class FrequencyTable(Enum):
             #     """Enumerate Frequency Tables."""
             #     AMIGA = 0
@@ -387,17 +620,21 @@ class FastTracker2XM:
             # if frequency_table is FrequencyTable.AMIGA:
             #     raise NotImplementedError("Amiga frequency table is not yet supported.")
 
-            # skip flags, tempo, bpm, pattern order table & any weird extra data
+            # skip the rest of the pattern order table & any weird extra data
             # jump directly to the first pattern header
             self.file.seek(xm_header_size)
 
+            # (pointer, size) of each pattern's packed data
+            self.patterns = []
             for i in range(pattern_count):
+                pattern_pointer = self.file.tell()
                 pattern_header_size = int.from_bytes(self.file.read(4), "little")
 
                 # skip packing type & rows per pattern
                 self.file.seek(3, SEEK_CUR)
 
                 pattern_data_size = int.from_bytes(self.file.read(2), "little")
+                self.patterns.append((pattern_pointer + pattern_header_size, pattern_data_size))
                 self.file.seek(pattern_data_size, SEEK_CUR)
 
                 # skip any extra data that's left over in the pattern header
@@ -406,6 +643,8 @@ class FastTracker2XM:
                     self.file.seek(pattern_header_size - 9, SEEK_CUR)
 
             self.samples = []
+            # (first sample number, sample count, keymap) of each instrument
+            self.instruments = []
 
             for i in range(instrument_count):
                 instrument_header_size = int.from_bytes(self.file.read(4), "little")
@@ -413,12 +652,18 @@ class FastTracker2XM:
                 self.file.seek(23, SEEK_CUR)
                 instrument_sample_count = int.from_bytes(self.file.read(2), "little")
 
-                # skip any extra data that's left over in the instrument header
+                # any extra data that's left over in the instrument header
                 # past the regular 29 bytes.
                 # none of the extra header features can be matched to anything
-                # in a WAVE "smpl" chunk, so we can just skip it all.
+                # in a WAVE "smpl" chunk, but the keymap tells us which sample
+                # each note plays.
+                keymap = None
                 if instrument_header_size > 29:
-                    self.file.seek(instrument_header_size - 29, SEEK_CUR)
+                    extra_header = self.file.read(instrument_header_size - 29)
+                    # skip sample header size
+                    if instrument_sample_count > 0 and len(extra_header) >= 100:
+                        keymap = extra_header[4:100]
+                self.instruments.append((len(self.samples), instrument_sample_count, keymap))
 
                 if instrument_sample_count > 0:
                     instrument_samples = []
@@ -462,24 +707,104 @@ class FastTracker2XM:
                         frequency = 8363 * 2**((4608 - period) / 768)
                         sample["rate"] = int(frequency)
 
+                    # each instrument's sample data follows its sample headers
                     for sample in instrument_samples:
-                        sample["data"] = self.file.read(sample["length"])
+                        sample["pointer"] = self.file.tell()
+                        self.file.seek(sample["length"], SEEK_CUR)
 
-                        if sample["width"] == 8//8:
-                            sample["data"] = pcm.decode_delta_encoding_8bit(sample["data"])
-                            sample["data"] = pcm.signed_to_unsigned_8bit(sample["data"])
-                        elif sample["width"] == 16//8:
-                            sample["data"] = pcm.decode_delta_encoding_16bit(sample["data"])
+                        sample["delta"] = True
+                        sample["flip_sign"] = sample["width"] == 8//8
                         self.samples.append(sample)
 
             for i in range(len(self.samples)):
                 self.samples[i]["number"] = i
 
-class UnrealEngineUMX:
+            if load_samples:
+                self.load_sample_data()
+
+    def find_used_samples(self) -> set:
+        """
+        Scans the patterns in the song's order list, and returns the numbers
+        of the samples they play.
+        """
+        # pairs of (instrument, note) that are actually played
+        played = set()
+        # notes without an instrument play the channel's last one, even if it
+        # was set in an earlier pattern, so follow the order list in sequence
+        channel_instruments = [0] * self.channel_count
+        patterns = {}
+        for pattern in self.orders:
+            if pattern >= len(self.patterns):
+                continue # missing patterns are empty
+            if pattern not in patterns:
+                pattern_pointer, pattern_data_size = self.patterns[pattern]
+                self.file.seek(pattern_pointer)
+                patterns[pattern] = self.file.read(pattern_data_size)
+            played |= self.decode_played_notes(patterns[pattern], channel_instruments)
+
+        used = set()
+        for instrument, note in played:
+            if instrument > len(self.instruments):
+                continue
+            first_sample, sample_count, keymap = self.instruments[instrument - 1]
+            if keymap is None:
+                # no keymap to go by, so any of them could be played
+                used.update(range(first_sample, first_sample + sample_count))
+            elif keymap[note - 1] < sample_count:
+                used.add(first_sample + keymap[note - 1])
+        return used
+
+    @staticmethod
+    def decode_played_notes(pattern_data, channel_instruments) -> set:
+        """
+        Decodes packed pattern data, returning a set of (instrument, note)
+        pairs for every note played.
+        channel_instruments holds the instrument each channel last played, and
+        is updated as the pattern sets new ones.
+        """
+        channel_count = len(channel_instruments)
+        if channel_count == 0:
+            return set()
+
+        played = set()
+        channel = 0
+        i = 0
+        try:
+            while i < len(pattern_data):
+                packing = pattern_data[i]
+                i += 1
+                note = instrument = 0
+                if packing & 0b10000000:
+                    if packing & 0b00000001:
+                        note = pattern_data[i]
+                        i += 1
+                    if packing & 0b00000010:
+                        instrument = pattern_data[i]
+                        i += 1
+                    # skip volume, effect type & effect parameter
+                    i += bin(packing & 0b00011100).count("1")
+                else:
+                    # unpacked, this byte is the note and the other 4 follow
+                    note = packing
+                    instrument = pattern_data[i]
+                    i += 4
+
+                if instrument:
+                    channel_instruments[channel] = instrument
+                # 97 is key off
+                if 0 < note < 97 and channel_instruments[channel]:
+                    played.add((channel_instruments[channel], note))
+                channel = (channel + 1) % channel_count
+        except IndexError:
+            pass # truncated pattern, keep what we've found
+
+        return played
+
+class UnrealEngineUMX(TrackerModule):
     """Retrieves module file contained within an Unreal Engine UMX package file."""
 
-    def __init__(self, file):
-        self.file = file
+    def __init__(self, file, load_samples=True):
+        super().__init__(file)
 
         self.file.seek(4)
         version = int.from_bytes(file.read(4), "little")
@@ -534,10 +859,24 @@ class UnrealEngineUMX:
             self.file.seek(4, SEEK_CUR) # skip following byte position
         chunk_size = self.read_compact_index() # serial size minus the object's header
         embedded_stream = BytesIO(self.file.read(chunk_size))
-        embedded_file = identify_module(embedded_stream)
+        self.embedded_file = identify_module(embedded_stream, load_samples)
 
-        self.title = embedded_file.title
-        self.samples = embedded_file.samples
+        self.title = self.embedded_file.title
+        self.samples = self.embedded_file.samples
+
+    def read_sample_data(self, sample, chunk_size=CHUNK_SIZE):
+        """
+        Yields sample's data converted for a WAV file, reading and converting
+        no more than chunk_size bytes at a time.
+        """
+        return self.embedded_file.read_sample_data(sample, chunk_size)
+
+    def find_used_samples(self) -> set:
+        """
+        Scans the patterns in the song's order list, and returns the numbers
+        of the samples they play.
+        """
+        return self.embedded_file.find_used_samples()
 
     def read_compact_index(self):
         """
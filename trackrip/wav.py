@@ -0,0 +1,89 @@
+"""For encoding samples as WAV files."""
+from math import floor
+import re
+import string
+import struct
+
+from .tracker import LoopType
+
+def get_file_name(sample) -> str:
+    """Returns a filesystem friendly WAV file name for sample."""
+    sample_file_name = str(sample["number"])
+    # ???: do we still need this, if we're also using re.sub below?
+    # sample's header is shared with every sink, so leave its name alone
+    name = "".join(filter(lambda x: x in set(string.printable), sample["name"]))
+    if name != "" and not name.isspace():
+        sample_file_name += " - " + name.strip()
+
+    # remove chars unfriendly to some filesystems (NTFS, etc)
+    # cracktro musicians love to include fancy chars in their sample names
+    sample_file_name = re.sub(r"[^\w\s\d-]", "_", sample_file_name)
+
+    return sample_file_name + ".wav"
+
+def build_header(sample, data_length, extra_length=0) -> bytes:
+    """
+    Returns the RIFF, fmt & data chunk headers for a mono WAV file holding
+    data_length bytes of sample's data, followed by extra_length bytes of
+    other chunks.
+    """
+    return struct.pack("<4sI4s4sIHHIIHH4sI",
+                       b"RIFF",
+                       # ChunkSize doesn't count "RIFF" or itself
+                       36 + data_length + extra_length,
+                       b"WAVE",
+                       b"fmt ", 16,
+                       1, # PCM
+                       1, # mono
+                       sample["rate"],
+                       sample["rate"] * sample["width"],
+                       sample["width"],
+                       sample["width"] * 8,
+                       b"data", data_length)
+
+def build_smpl_chunk(sample) -> bytes:
+    """
+    Returns a smpl chunk describing sample's loop, or nothing if it doesn't
+    loop.
+    """
+    if sample["loop_type"] == LoopType.OFF:
+        return b""
+
+    # construct sample chunk
+    smpl_chunk = b"smpl"
+    # chunk size
+    smpl_chunk += int(36 + (1 * 24) + 0).to_bytes(4, "little")
+    # manufacturer & product
+    smpl_chunk += bytes(8)
+    # sample period
+    smpl_chunk += int(floor(1000000000 / sample["rate"])).to_bytes(4, "little")
+
+    # TODO: figure me out
+    # midi unity note, 60 = middle C
+    smpl_chunk += int(60).to_bytes(4, "little")
+    # midi pitch fraction
+    smpl_chunk += bytes(4)
+
+    # smpte format & offset
+    smpl_chunk += bytes(8)
+    # number of sampler loops (should always be 1)
+    smpl_chunk += int(1).to_bytes(4, "little")
+    # sampler data
+    smpl_chunk += bytes(4)
+    # sample loops
+    # cue point ID
+    smpl_chunk += bytes(4)
+    # loop type
+    if sample["loop_type"] == LoopType.FORWARD:
+        smpl_loop_type = 0
+    elif sample["loop_type"] == LoopType.PING_PONG:
+        smpl_loop_type = 1
+    smpl_chunk += int(smpl_loop_type).to_bytes(4, "little")
+    # loop start
+    smpl_chunk += int(sample["loop_start"]).to_bytes(4, "little")
+    # loop end
+    smpl_chunk += int(sample["loop_end"] - 1).to_bytes(4, "little")
+    # fration, play count
+    smpl_chunk += bytes(8)
+
+    return smpl_chunk